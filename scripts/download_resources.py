@@ -2,17 +2,24 @@
 Download resources from the Awesome Claude Code repository CSV file.
 
 This script downloads all active resources (or filtered subset) from GitHub
-repositories listed in the resource-metadata.csv file. It respects rate
-limiting and organizes downloads by category.
+repositories listed in the resource-metadata.csv file. Resources are
+downloaded concurrently over a shared connection pool; the script respects
+rate limiting and organizes downloads by category.
 
 Resources are saved to two locations:
 - Archive directory: All resources regardless of license (.myob/downloads/)
 - Hosted directory: Only open-source licensed resources (resources/)
 
+Single files are fetched from raw.githubusercontent.com, which does not count
+against the API rate limit; directories and gists use the GitHub API. When
+authenticated, several entries from the same repository are fetched together
+in a single GraphQL query.
+
 Note: Authentication is optional but recommended to avoid rate limiting:
     - Unauthenticated: 60 requests/hour
-    - Authenticated: 5,000 requests/hour
+    - Authenticated: 5,000 requests/hour per token
     export GITHUB_TOKEN=your_github_token
+    export GITHUB_TOKENS=token_one,token_two  # optional pool, rotated per request
 
 Usage:
     python download_resources.py [options]
@@ -23,21 +30,44 @@ Options:
     --max-downloads N       Limit number of downloads (for testing)
     --output-dir DIR        Custom archive directory (default: .myob/downloads)
     --hosted-dir DIR        Custom hosted directory (default: resources)
+    --force                 Re-check resources that were already downloaded
 """
 
 import argparse
+import contextlib
 import csv
+import email.utils
+import functools
+import hashlib
+import itertools
+import json
 import os
 import random
 import re
+import shutil
+import tarfile
+import threading
 import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, NamedTuple
 
 import requests
 import yaml  # type: ignore[import-untyped]
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# Use orjson for GitHub JSON responses if available; it parses faster than json
+try:
+    import orjson
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    # orjson not installed, that's okay
+    _loads = json.loads
 
 # Load environment variables from .myob/.env
 load_dotenv()
@@ -47,21 +77,173 @@ USER_AGENT = "awesome-claude-code Downloader/1.0"
 CSV_FILE = "../THE_RESOURCES_TABLE.csv"
 DEFAULT_OUTPUT_DIR = ".myob/downloads"
 HOSTED_OUTPUT_DIR = "resources"
+# Requests to this host spend the API rate limit and are paced; the raw CDN is not
+GITHUB_API_URL = "https://api.github.com/"
+# GitHub GraphQL endpoint, and the most objects requested in one query
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 50
+# Read size used when streaming response bodies to disk
+CHUNK_SIZE = 65536
+# ETag sidecar (inside the archive directory) used for conditional requests
+ETAG_CACHE_FILE = ".etags.json"
+# Maximum number of resources downloaded in parallel
+MAX_CONCURRENT_DOWNLOADS = 16
+# Keep-alive connections kept per host; above MAX_CONCURRENT_DOWNLOADS so workers never wait
+HTTP_POOL_SIZE = 32
+
+RAW_ACCEPT = "application/vnd.github.v3.raw"
+JSON_ACCEPT = "application/vnd.github+json"
+# Tokens with fewer remaining requests than this are skipped until their reset
+MIN_TOKEN_REMAINING = 10
+# Upper bound on the exponential retry backoff, in seconds
+MAX_BACKOFF = 60
+# Upper bound on the pacing delay between requests, in seconds
+MAX_PACING_DELAY = 5.0
+
+
+class TokenPool:
+    """
+    Round-robin pool of GitHub tokens.
+    Tracks each token's rate limit from response headers and skips tokens that
+    are nearly exhausted until their reset time.
+    """
 
-# Setup headers with optional GitHub token
-HEADERS = {
-    "User-Agent": USER_AGENT,
-    "Accept": "application/vnd.github.v3.raw",
-    "X-GitHub-Api-Version": "2022-11-28",
-}
-github_token = os.environ.get("GITHUB_TOKEN")
-if github_token:
-    # Use Bearer token format as per GitHub API documentation
-    HEADERS["Authorization"] = f"Bearer {github_token}"
-    print("Using authenticated requests (5,000/hour limit)")
+    def __init__(self, tokens: list[str]) -> None:
+        self.tokens = tokens
+        self._cycle = itertools.cycle(tokens)
+        self._lock = threading.Lock()
+        # token -> (remaining, reset epoch)
+        self._limits: dict[str, tuple[int, int]] = {}
+
+    def next_token(self) -> str | None:
+        """Return the next usable token, or None if the pool is empty."""
+        if not self.tokens:
+            return None
+
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self.tokens)):
+                token = next(self._cycle)
+                limit = self._limits.get(token)
+                if limit is None or limit[0] >= MIN_TOKEN_REMAINING or limit[1] <= now:
+                    return token
+
+            # Every token is nearly exhausted; use the one that resets first
+            return min(self.tokens, key=lambda t: self._limits[t][1])
+
+    def has_budget(self) -> bool:
+        """Return True if any token is not known to be exhausted."""
+        now = time.time()
+        with self._lock:
+            return any(
+                limit is None or limit[0] > 0 or limit[1] <= now
+                for limit in (self._limits.get(token) for token in self.tokens)
+            )
+
+    def budget(self) -> tuple[int | None, int | None]:
+        """
+        Combined remaining requests of every token and the earliest reset.
+        Unknown (None, None) until each token has reported a limit that hasn't reset.
+        """
+        now = time.time()
+        with self._lock:
+            limits = [self._limits.get(token) for token in self.tokens]
+        known = [limit for limit in limits if limit is not None and limit[1] > now]
+        if not known or len(known) < len(limits):
+            return None, None
+        return sum(limit[0] for limit in known), min(limit[1] for limit in known)
+
+    def update(self, token: str | None, headers: Any) -> None:
+        """Record the rate limit reported for a token in response headers."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if not token or remaining is None or reset is None:
+            return
+
+        with self._lock:
+            self._limits[token] = (int(remaining), int(reset))
+
+
+class RateLimitState:
+    """
+    Core API rate limit available to the run: the last one GitHub reported when
+    unauthenticated, or the combined budget of the token pool.
+    Used to pace requests evenly over the time left until the limit resets.
+    Pacing is shared by all worker threads through a single next-request slot.
+    """
+
+    def __init__(self) -> None:
+        self.remaining: int | None = None
+        self.reset: int | None = None
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, headers: Any) -> None:
+        """Record the rate limit from response headers, if present."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        self.set(int(remaining), int(reset))
+
+    def set(self, remaining: int | None, reset: int | None) -> None:
+        """Record the budget directly, e.g. from TokenPool.budget()."""
+        with self._lock:
+            self.remaining = remaining
+            self.reset = reset
+
+    def recommended_delay(self) -> float:
+        """Seconds to wait before the next request to stay within the limit."""
+        with self._lock:
+            if self.remaining is None or self.reset is None:
+                return 0.0
+            delay = (self.reset - time.time()) / max(self.remaining, 1)
+        return min(max(delay, 0.0), MAX_PACING_DELAY)
+
+    def wait_for_slot(self) -> None:
+        """Block until this thread's turn, keeping the combined request rate in budget."""
+        delay = self.recommended_delay()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + delay
+        time.sleep(slot - now)
+
+    def max_parallel(self, limit: int) -> int:
+        """Number of parallel downloads the remaining budget can sustain, up to limit."""
+        with self._lock:
+            if self.remaining is None:
+                return limit
+            return max(1, min(limit, self.remaining))
+
+
+# Setup token pool: GITHUB_TOKENS (comma-separated) or a single GITHUB_TOKEN
+github_tokens = [t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",") if t.strip()]
+if not github_tokens and os.environ.get("GITHUB_TOKEN"):
+    github_tokens = [os.environ["GITHUB_TOKEN"]]
+TOKEN_POOL = TokenPool(github_tokens)
+RATE_LIMIT = RateLimitState()
+if github_tokens:
+    print(f"Using authenticated requests ({len(github_tokens)} token(s), 5,000/hour limit each)")
 else:
     print("Using unauthenticated requests (60/hour limit)")
 
+# Shared session so worker threads reuse pooled keep-alive connections.
+# Retries are handled by download_github_file, so the adapter does not retry.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0),
+)
+SESSION.headers.update(
+    {
+        "User-Agent": USER_AGENT,
+        "Accept": RAW_ACCEPT,
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+)
+
 # Open source licenses that allow hosting
 OPEN_SOURCE_LICENSES = {
     "MIT",
@@ -85,84 +267,312 @@ OPEN_SOURCE_LICENSES = {
     "BSL-1.0",
 }
 
+
+def build_headers(accept: str = RAW_ACCEPT) -> dict[str, str]:
+    """
+    Build per-request headers, authenticating with the next token from the pool.
+    Static headers (User-Agent, API version) are set once on the session.
+    """
+    headers = {"Accept": accept}
+    token = TOKEN_POOL.next_token()
+    if token:
+        # Use Bearer token format as per GitHub API documentation
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def github_get(
+    url: str,
+    accept: str = RAW_ACCEPT,
+    timeout: int = 30,
+    etag: str | None = None,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    GET a URL with pooled-token headers and record the token's rate limit.
+    API requests are paced to the remaining budget; other hosts are not.
+    If an ETag is given the request is conditional and may return 304.
+    """
+    if url.startswith(GITHUB_API_URL):
+        RATE_LIMIT.wait_for_slot()
+    headers = build_headers(accept)
+    if etag:
+        headers["If-None-Match"] = etag
+    response = SESSION.get(url, headers=headers, timeout=timeout, stream=stream)
+    token = headers.get("Authorization", "").removeprefix("Bearer ")
+    if token:
+        # Pace against every token's budget, not just the one that answered
+        TOKEN_POOL.update(token, response.headers)
+        RATE_LIMIT.set(*TOKEN_POOL.budget())
+    else:
+        RATE_LIMIT.update(response.headers)
+    return response
+
+
+class EtagCache:
+    """
+    JSON sidecar mapping request URLs to the ETag and SHA-256 of the last body.
+    Lets repeat runs send conditional requests and skip unchanged downloads.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[str]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Could not load ETag cache {path}: {e}")
+
+    def get(self, url: str) -> str | None:
+        """Return the cached ETag for a URL, if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+        return entry[0] if entry else None
+
+    def sha256(self, url: str) -> str | None:
+        """Return the SHA-256 of the body last downloaded from a URL, if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+        return entry[1] if entry else None
+
+    def set(self, url: str, etag: str | None, sha256: str) -> None:
+        """Remember the ETag and body hash of a successful response."""
+        if not etag:
+            return
+        with self._lock:
+            self._entries[url] = [etag, sha256]
+
+    def save(self) -> None:
+        """Write the cache back to disk."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+
+
+class UrlInfo(NamedTuple):
+    """Parsed GitHub URL. Fields that don't apply to the URL type are empty."""
+
+    type: str
+    owner: str
+    repo: str = ""
+    branch: str = ""
+    path: str = ""
+    gist_id: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class DownloadTask:
+    """A resource resolved from the CSV, ready to download."""
+
+    url_info: UrlInfo
+    resource_path: str
+    hosted_path: str | None
+    resource_license: str
+    display_name: str
+
+
 # Category name mapping - removed to use sanitized names for both directories
 # Keeping the mapping dict empty for now in case we need it later
 _CATEGORY_MAPPING: dict[str, str] = {}
 
 
+# Filename sanitization patterns
+# Added commas and other special chars that could cause issues
+_BAD_CHARS = re.compile(r'[<>:"/\\|?*,;]')
+_WS = re.compile(r"\s+")
+
+# GitHub URL patterns, tried in order
+# File in repository
+_FILE_RE = re.compile(r"https://github\.com/([^/]+)/([^/]+)/(?:blob|raw)/([^/]+)/(.+)")
+# Directory in repository
+_DIR_RE = re.compile(r"https://github\.com/([^/]+)/([^/]+)/tree/([^/]+)/(.+)")
+# Repository root
+_REPO_RE = re.compile(r"https://github\.com/([^/]+)/([^/]+)/?$")
+# Gist
+_GIST_RE = re.compile(r"https://gist\.github\.com/([^/]+)/([^/#]+)")
+_URL_PATTERNS = (("file", _FILE_RE), ("dir", _DIR_RE), ("repo", _REPO_RE), ("gist", _GIST_RE))
+
+
 def sanitize_filename(name: str) -> str:
     """Sanitize a string to be safe for use as a filename."""
     # Replace spaces with hyphens and remove/replace problematic characters
-    # Added commas and other special chars that could cause issues
-    name = re.sub(r'[<>:"/\\|?*,;]', "", name)
-    name = re.sub(r"\s+", "-", name)
+    name = _BAD_CHARS.sub("", name)
+    name = _WS.sub("-", name)
     name = name.strip("-.")
     return name[:255]  # Max filename length
 
 
-def parse_github_url(url: str) -> dict[str, str] | None:
+@functools.lru_cache(maxsize=4096)
+def parse_github_url(url: str) -> UrlInfo | None:
     """
     Parse GitHub URL and extract owner, repo, branch, and path.
-    Returns a dict with keys: owner, repo, branch, path, type
-    """
-    patterns = {
-        # File in repository
-        "file": r"https://github\.com/([^/]+)/([^/]+)/(?:blob|raw)/([^/]+)/(.+)",
-        # Directory in repository
-        "dir": r"https://github\.com/([^/]+)/([^/]+)/tree/([^/]+)/(.+)",
-        # Repository root
-        "repo": r"https://github\.com/([^/]+)/([^/]+)/?$",
-        # Gist
-        "gist": r"https://gist\.github\.com/([^/]+)/([^/#]+)",
-    }
-
-    for url_type, pattern in patterns.items():
-        match = re.match(pattern, url)
+    Returns an immutable UrlInfo; results are cached since lists repeat URLs.
+    """
+    for url_type, pattern in _URL_PATTERNS:
+        match = pattern.match(url)
         if match:
             if url_type == "gist":
-                return {
-                    "type": "gist",
-                    "owner": match.group(1),
-                    "gist_id": match.group(2),
-                }
+                return UrlInfo(type="gist", owner=match.group(1), gist_id=match.group(2))
             elif url_type == "repo":
-                return {
-                    "type": "repo",
-                    "owner": match.group(1),
-                    "repo": match.group(2),
-                }
+                return UrlInfo(type="repo", owner=match.group(1), repo=match.group(2))
             else:
-                return {
-                    "type": url_type,
-                    "owner": match.group(1),
-                    "repo": match.group(2),
-                    "branch": match.group(3),
-                    "path": match.group(4),
-                }
+                return UrlInfo(
+                    type=url_type,
+                    owner=match.group(1),
+                    repo=match.group(2),
+                    branch=match.group(3),
+                    path=match.group(4),
+                )
 
     return None
 
 
+@contextlib.contextmanager
+def atomic_write(path: str) -> Iterator[BinaryIO]:
+    """
+    Open a temporary file next to path for binary writing and move it into place
+    on success, so an interrupted download never leaves a partial file behind.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+@contextlib.contextmanager
+def atomic_dir(path: str) -> Iterator[str]:
+    """
+    Yield a temporary directory next to path and move it into place on success,
+    replacing any previous download. Nothing is moved if no file was written, and
+    an interrupted download never leaves a partial directory behind.
+    """
+    tmp_path = f"{path}.tmp"
+    # Clear out anything left by a killed run
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    try:
+        yield tmp_path
+        if has_content(tmp_path):
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def file_sha256(path: str) -> str:
+    """Return the SHA-256 of a file on disk."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def has_content(path: str) -> bool:
+    """
+    Return True if path is a non-empty file or a directory with at least one file
+    other than the *.tmp leftovers of an interrupted write.
+    """
+    if os.path.isdir(path):
+        return any(not name.endswith(".tmp") for name in os.listdir(path))
+    return os.path.isfile(path) and os.path.getsize(path) > 0
+
+
+def write_stream(response: requests.Response, path: str) -> str:
+    """Write a streamed response body to path chunk by chunk; return its SHA-256."""
+    digest = hashlib.sha256()
+    with atomic_write(path) as f:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            f.write(chunk)
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Parse a Retry-After header (seconds or an HTTP date) into seconds from now."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def retry_delay(response: requests.Response | None, retry_count: int) -> float:
+    """
+    Seconds to wait before retrying a failed request.
+    Honors Retry-After and, once the rate limit is exhausted and no other token has
+    budget, X-RateLimit-Reset; otherwise uses capped exponential backoff with jitter.
+    """
+    if response is not None and response.status_code in (403, 429):
+        retry_after = parse_retry_after(response.headers.get("Retry-After", ""))
+        if retry_after is not None:
+            return retry_after
+
+        reset_time = response.headers.get("X-RateLimit-Reset")
+        if (
+            reset_time
+            and response.headers.get("X-RateLimit-Remaining") == "0"
+            and not TOKEN_POOL.has_budget()
+        ):
+            return max(0.0, int(reset_time) - time.time())
+
+    return min(MAX_BACKOFF, 2**retry_count) + random.uniform(0, 1)
+
+
 def download_github_file(
-    url_info: dict[str, str], output_path: str, retry_count: int = 0, max_retries: int = 3
+    url_info: UrlInfo,
+    output_path: str,
+    retry_count: int = 0,
+    max_retries: int = 3,
+    etag_cache: EtagCache | None = None,
 ) -> bool:
     """
     Download a file from GitHub using the API.
+    Directories and gists are assembled in a temporary directory and moved into place
+    only when complete. If an ETag cache is given and the output already exists, the
+    request is conditional and an unchanged (304) resource counts as a success.
+    Parent directories must already exist; process_resources creates them up front.
     Returns True if successful, False otherwise.
     """
+
+    def cached_etag(api_url: str) -> str | None:
+        if not etag_cache or not has_content(output_path):
+            return None
+        # Don't trust the ETag for a single file whose bytes no longer match
+        if url_info.type == "file" and etag_cache.sha256(api_url) != file_sha256(output_path):
+            return None
+        return etag_cache.get(api_url)
+
+    def not_modified() -> bool:
+        print("    Not modified since last download")
+        return True
+
     response: requests.Response | None = None
     try:
-        if url_info["type"] == "file":
-            # Download single file
-            api_url = (
-                f"https://api.github.com/repos/{url_info['owner']}/"
-                f"{url_info['repo']}/contents/{url_info['path']}?ref={url_info['branch']}"
+        if url_info.type == "file":
+            # Download single file from the raw CDN, which doesn't spend API rate limit
+            raw_url = (
+                f"https://raw.githubusercontent.com/{url_info.owner}/{url_info.repo}/"
+                f"{url_info.branch}/{url_info.path}"
             )
-            response = requests.get(api_url, headers=HEADERS, timeout=30)
+            response = github_get(raw_url, accept="*/*", etag=cached_etag(raw_url), stream=True)
+            if response.status_code == 304:
+                return not_modified()
 
             # Log response details
             if response.status_code != 200:
-                print(f"    API Response: {response.status_code}")
+                print(f"    Response status: {response.status_code}")
                 print(
                     "    Headers: X-RateLimit-Remaining"
                     f"={response.headers.get('X-RateLimit-Remaining', 'N/A')}"
@@ -170,26 +580,25 @@ def download_github_file(
                 print(f"    Response: {response.text[:300]}...")
 
             if response.status_code == 200:
-                # Create directory if needed
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                # Write file content
-                with open(output_path, "wb") as f:
-                    f.write(response.content)
+                # Stream file content to disk
+                sha256 = write_stream(response, output_path)
+                if etag_cache:
+                    etag_cache.set(raw_url, response.headers.get("ETag"), sha256)
                 return True
             else:
                 print(f"    Failed to get file content - Status: {response.status_code}")
 
-        elif url_info["type"] == "dir":
-            # List directory contents
+        elif url_info.type == "dir":
+            # Fetch the repository tarball in one request and extract the directory from it
             api_url = (
-                f"https://api.github.com/repos/{url_info['owner']}/{url_info['repo']}/contents/"
-                f"{url_info['path']}?ref={url_info['branch']}"
+                f"https://api.github.com/repos/{url_info.owner}/{url_info.repo}/tarball/"
+                f"{url_info.branch}"
             )
-            # Update headers to use proper Accept header for directory listing
-            dir_headers = HEADERS.copy()
-            dir_headers["Accept"] = "application/vnd.github+json"
-            response = requests.get(api_url, headers=dir_headers, timeout=30)
+            response = github_get(
+                api_url, accept=JSON_ACCEPT, etag=cached_etag(api_url), stream=True
+            )
+            if response.status_code == 304:
+                return not_modified()
 
             # Log response details
             if response.status_code != 200:
@@ -201,35 +610,53 @@ def download_github_file(
                 print(f"    Response: {response.text[:300]}...")
 
             if response.status_code == 200:
-                # Create directory
-                os.makedirs(output_path, exist_ok=True)
-
-                # Download each file in the directory
-                items = response.json()
-                for item in items:
-                    if item["type"] == "file":
-                        file_path = os.path.join(output_path, item["name"])
-                        # Download the file content
-                        file_response = requests.get(
-                            item["download_url"], headers=HEADERS, timeout=30
-                        )
-                        if file_response.status_code != 200:
-                            print(
-                                f"      File download failed: {item['name']} - "
-                                f"Status: {file_response.status_code}"
-                            )
-                        if file_response.status_code == 200:
-                            with open(file_path, "wb") as f:
-                                f.write(file_response.content)
+                # Stream-extract the files that sit directly in the directory
+                dir_prefix = url_info.path.strip("/") + "/"
+                digest = hashlib.sha256()
+                extracted_count = 0
+                response.raw.decode_content = True
+                try:
+                    with (
+                        atomic_dir(output_path) as tmp_dir,
+                        tarfile.open(fileobj=response.raw, mode="r|gz") as tar,
+                    ):
+                        for member in tar:
+                            if not member.isfile():
+                                continue
+                            # Strip the "{owner}-{repo}-{sha}/" root GitHub adds
+                            _, _, member_path = member.name.partition("/")
+                            if not member_path.startswith(dir_prefix):
+                                continue
+                            name = member_path[len(dir_prefix) :]
+                            if "/" in name:
+                                continue
+
+                            source = tar.extractfile(member)
+                            if source is None:
+                                continue
+                            with atomic_write(os.path.join(tmp_dir, name)) as f:
+                                while chunk := source.read(CHUNK_SIZE):
+                                    f.write(chunk)
+                                    digest.update(chunk)
+                            extracted_count += 1
+                finally:
+                    response.close()
+
+                if extracted_count == 0:
+                    print(f"    No files found under {url_info.path} in tarball")
+                    return False
+
+                if etag_cache:
+                    etag_cache.set(api_url, response.headers.get("ETag"), digest.hexdigest())
                 return True
 
-        elif url_info["type"] == "gist":
+        elif url_info.type == "gist":
             # Download gist
-            api_url = f"https://api.github.com/gists/{url_info['gist_id']}"
-            # Update headers to use proper Accept header for gist API
-            gist_headers = HEADERS.copy()
-            gist_headers["Accept"] = "application/vnd.github+json"
-            response = requests.get(api_url, headers=gist_headers, timeout=30)
+            api_url = f"https://api.github.com/gists/{url_info.gist_id}"
+            # Use proper Accept header for gist API
+            response = github_get(api_url, accept=JSON_ACCEPT, etag=cached_etag(api_url))
+            if response.status_code == 304:
+                return not_modified()
 
             # Log response details
             if response.status_code != 200:
@@ -241,19 +668,43 @@ def download_github_file(
                 print(f"    Response: {response.text[:300]}...")
 
             if response.status_code == 200:
-                gist_data = response.json()
-                # Create directory for gist
-                os.makedirs(output_path, exist_ok=True)
-
+                gist_data = _loads(response.content)
                 # Download each file in the gist
-                for filename, file_info in gist_data["files"].items():
-                    file_path = os.path.join(output_path, filename)
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(file_info["content"])
+                with atomic_dir(output_path) as tmp_dir:
+                    for filename, file_info in gist_data["files"].items():
+                        file_path = os.path.join(tmp_dir, filename)
+                        if not file_info.get("truncated"):
+                            write_text_file(file_path, file_info["content"])
+                            continue
+
+                        # Large gist files are truncated in the API response; fetch the raw file
+                        raw_response = github_get(file_info["raw_url"], accept="*/*", stream=True)
+                        if raw_response.status_code != 200:
+                            raise requests.exceptions.HTTPError(
+                                f"Truncated gist file {filename} failed - "
+                                f"Status: {raw_response.status_code}"
+                            )
+                        write_stream(raw_response, file_path)
+                if etag_cache:
+                    etag_cache.set(
+                        api_url,
+                        response.headers.get("ETag"),
+                        hashlib.sha256(response.content).hexdigest(),
+                    )
                 return True
 
-        # Handle rate limiting
-        if response and response.status_code == 429:
+        # Handle rate limiting: 429, an exhausted primary limit, or a secondary limit
+        # (403 with Retry-After); raise so the retry waits as GitHub asks
+        if response is not None and (
+            response.status_code == 429
+            or (
+                response.status_code == 403
+                and (
+                    response.headers.get("X-RateLimit-Remaining") == "0"
+                    or "Retry-After" in response.headers
+                )
+            )
+        ):
             reset_time = response.headers.get("X-RateLimit-Reset")
             if reset_time:
                 reset_datetime = datetime.fromtimestamp(int(reset_time))
@@ -266,10 +717,12 @@ def download_github_file(
 
     except Exception as e:
         if retry_count < max_retries:
-            wait_time = (2**retry_count) + random.uniform(1, 2)
+            wait_time = retry_delay(response, retry_count)
             print(f"  Retry in {wait_time:.1f}s... (Error: {str(e)})")
             time.sleep(wait_time)
-            return download_github_file(url_info, output_path, retry_count + 1, max_retries)
+            return download_github_file(
+                url_info, output_path, retry_count + 1, max_retries, etag_cache
+            )
 
         print(f"  Failed after {max_retries} retries: {str(e)}")
         return False
@@ -287,9 +740,11 @@ def load_overrides() -> dict[str, Any]:
         return data.get("overrides", {})
 
 
-def apply_overrides(row: dict[str, str], overrides: dict[str, Any]) -> dict[str, str]:
-    """Apply overrides to a resource row."""
-    resource_id = row.get("ID", "")
+def apply_overrides(
+    row: list[str], id_col: int, columns: dict[str, int], overrides: dict[str, Any]
+) -> list[str]:
+    """Apply overrides to a resource row, using column indices from the CSV header."""
+    resource_id = row[id_col]
     if not resource_id or resource_id not in overrides:
         return row
 
@@ -299,24 +754,185 @@ def apply_overrides(row: dict[str, str], overrides: dict[str, Any]) -> dict[str,
     for field, value in override_config.items():
         if not field.endswith("_locked") and field != "notes":
             if field == "license":
-                row["License"] = value
+                row[columns["License"]] = value
             elif field == "active":
-                row["Active"] = value
+                row[columns["Active"]] = value
             elif field == "description":
-                row["Description"] = value
+                row[columns["Description"]] = value
 
     return row
 
 
+def link_or_copy(source: str, destination: str) -> None:
+    """
+    Hardlink a file to destination, replacing any existing file.
+    Falls back to a copy when hardlinks are unsupported (e.g. across filesystems).
+    """
+    if os.path.exists(destination):
+        if os.path.samefile(source, destination):
+            return
+        os.unlink(destination)
+
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def link_tree(source_dir: str, destination_dir: str) -> None:
+    """Recreate a directory tree at destination, hardlinking each file."""
+    for root, _, files in os.walk(source_dir):
+        target_root = os.path.join(destination_dir, os.path.relpath(root, source_dir))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            link_or_copy(os.path.join(root, name), os.path.join(target_root, name))
+
+
+def link_hosted(source: str, hosted_path: str) -> None:
+    """
+    Link an archived file or directory into the hosted directory, creating the
+    hosted directories only now so failed downloads never leave empty ones.
+    """
+    if os.path.isdir(source):
+        link_tree(source, hosted_path)
+    else:
+        os.makedirs(os.path.dirname(hosted_path), exist_ok=True)
+        link_or_copy(source, hosted_path)
+
+
+def update_hosted_copy(source: str, hosted_path: str) -> bool:
+    """
+    Link an archived resource into the hosted directory.
+    A failure only warns: the archive copy is complete, so the download still counts.
+    """
+    try:
+        link_hosted(source, hosted_path)
+    except Exception as e:
+        print(f"  ⚠️  Failed to link hosted copy {hosted_path}: {e}")
+        return False
+    return True
+
+
+def write_text_file(path: str, text: str) -> None:
+    """Write UTF-8 text to path."""
+    with atomic_write(path) as f:
+        f.write(text.encode("utf-8"))
+
+
+def write_graphql_object(task: DownloadTask, obj: dict[str, Any] | None) -> bool:
+    """
+    Write a GraphQL Blob (file) or Tree (directory) for a task.
+    Returns False, writing nothing, if any needed file is missing, binary or truncated
+    (GraphQL cuts off the text of large blobs).
+    """
+    if not obj:
+        return False
+
+    if task.url_info.type == "file":
+        if obj.get("isBinary") or obj.get("isTruncated") or obj.get("text") is None:
+            return False
+        write_text_file(task.resource_path, obj["text"])
+        return True
+
+    # Directory: the files that sit directly in it, as with the tarball
+    blobs = [entry for entry in obj.get("entries", []) if entry["type"] == "blob"]
+    if not blobs or any(
+        not entry["object"]
+        or entry["object"].get("isBinary")
+        or entry["object"].get("isTruncated")
+        or entry["object"].get("text") is None
+        for entry in blobs
+    ):
+        return False
+
+    with atomic_dir(task.resource_path) as tmp_dir:
+        for entry in blobs:
+            write_text_file(os.path.join(tmp_dir, entry["name"]), entry["object"]["text"])
+    return True
+
+
+def fetch_with_graphql(owner: str, repo: str, tasks: list[DownloadTask]) -> list[DownloadTask]:
+    """
+    Fetch several files/directories from one repository in a single GraphQL query.
+    Returns the tasks that were written; the rest should fall back to REST.
+    """
+    blob_fields = "... on Blob { text isBinary isTruncated }"
+    fields = []
+    for i, task in enumerate(tasks):
+        expression = json.dumps(f"{task.url_info.branch}:{task.url_info.path.strip('/')}")
+        fields.append(
+            f"f{i}: object(expression: {expression}) {{ {blob_fields} "
+            f"... on Tree {{ entries {{ name type object {{ {blob_fields} }} }} }} }}"
+        )
+    query = (
+        f"query {{ repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+        f"{{ {' '.join(fields)} }} }}"
+    )
+
+    try:
+        # GraphQL has its own per-token point budget, which these response headers report
+        # (X-RateLimit-Resource: graphql). TOKEN_POOL tracks the REST core limit, so they
+        # are not recorded there. The request still takes a REST pacing slot: GitHub's
+        # secondary limits count REST and GraphQL requests together. A batch costs about one
+        # point, far below the REST budget, so spacing batches like REST requests keeps
+        # both limits safe.
+        RATE_LIMIT.wait_for_slot()
+        response = SESSION.post(
+            GRAPHQL_URL, json={"query": query}, headers=build_headers(JSON_ACCEPT), timeout=30
+        )
+        if response.status_code != 200:
+            print(f"  GraphQL request for {owner}/{repo} failed - Status: {response.status_code}")
+            return []
+        repository = (_loads(response.content).get("data") or {}).get("repository") or {}
+
+        written = []
+        for i, task in enumerate(tasks):
+            if write_graphql_object(task, repository.get(f"f{i}")):
+                written.append(task)
+    except Exception as e:
+        print(f"  GraphQL request for {owner}/{repo} failed: {e}")
+        return []
+
+    for task in written:
+        if task.hosted_path:
+            update_hosted_copy(task.resource_path, task.hosted_path)
+
+    print(f"  GraphQL: fetched {len(written)}/{len(tasks)} resources from {owner}/{repo}")
+    return written
+
+
+def download_resource(task: DownloadTask, etag_cache: EtagCache | None = None) -> bool:
+    """
+    Download a single resource to the archive and, if given, link it to the hosted path.
+    Runs in a worker thread. Returns True if the download succeeded; a failed hosted
+    link is reported separately and does not fail the download.
+    """
+    download_success = download_github_file(
+        task.url_info, task.resource_path, etag_cache=etag_cache
+    )
+
+    if download_success:
+        print(f"  ✅ Downloaded successfully: {task.display_name}")
+        # Also relinks unchanged (304) resources in case hosted files went missing
+        if task.hosted_path and update_hosted_copy(task.resource_path, task.hosted_path):
+            print(f"  📦 Hosted copy: {task.hosted_path}")
+    else:
+        print(f"  ❌ Download failed: {task.display_name}")
+
+    return download_success
+
+
 def process_resources(
     category_filter: str | None = None,
     license_filter: str | None = None,
     max_downloads: int | None = None,
     output_dir: str = DEFAULT_OUTPUT_DIR,
     hosted_dir: str = HOSTED_OUTPUT_DIR,
+    force: bool = False,
 ) -> None:
     """
     Process and download resources from the CSV file.
+    Resources already in the archive are skipped unless force is set.
     """
     start_time = datetime.now()
     print(f"Starting download at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -325,9 +941,9 @@ def process_resources(
 
     # Check rate limit status
     try:
-        rate_check = requests.get("https://api.github.com/rate_limit", headers=HEADERS, timeout=10)
+        rate_check = github_get("https://api.github.com/rate_limit", accept=JSON_ACCEPT, timeout=10)
         if rate_check.status_code == 200:
-            rate_data = rate_check.json()
+            rate_data = _loads(rate_check.content)
             core_limit = rate_data.get("rate", {})
             print("\nGitHub API Rate Limit Status:")
             print(
@@ -340,55 +956,71 @@ def process_resources(
     except Exception as e:
         print(f"Could not check rate limit: {e}")
 
+    # Never run more downloads in parallel than there are requests left
+    max_workers = RATE_LIMIT.max_parallel(MAX_CONCURRENT_DOWNLOADS)
+
     # Load overrides
     overrides = load_overrides()
     if overrides:
         print(f"\nLoaded {len(overrides)} resource overrides")
 
+    # Load ETags recorded by previous runs
+    etag_cache = EtagCache(os.path.join(output_dir, ETAG_CACHE_FILE))
+
     # Track statistics
     total_resources = 0
     downloaded = 0
     skipped = 0
+    already_downloaded = 0
     failed = 0
+    tasks: list[DownloadTask] = []
 
-    # Read CSV
+    # Phase 1: filter the CSV and resolve every download into a task (no network)
     with open(CSV_FILE, newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
+        reader = csv.reader(file)
+        idx = {name: i for i, name in enumerate(next(reader, []))}
+        id_col = idx["ID"]
+        name_col = idx["Display Name"]
+        category_col = idx["Category"]
+        primary_col = idx["Primary Link"]
+        secondary_col = idx["Secondary Link"]
+        active_col = idx["Active"]
+        license_col = idx["License"]
 
         for row in reader:
             # Apply overrides to the row
-            row = apply_overrides(row, overrides)
+            row = apply_overrides(row, id_col, idx, overrides)
             # Check if we've reached the download limit
-            if max_downloads and downloaded >= max_downloads:
+            if max_downloads and len(tasks) >= max_downloads:
                 print(f"\nReached download limit ({max_downloads}). Stopping.")
                 break
 
             # Skip inactive resources
-            if row["Active"].upper() != "TRUE":
+            if row[active_col].upper() != "TRUE":
                 continue
 
             total_resources += 1
 
             # Apply filters
-            if category_filter and row["Category"] != category_filter:
+            if category_filter and row[category_col] != category_filter:
                 continue
 
-            if license_filter and row.get("License", "") != license_filter:
+            if license_filter and row[license_col] != license_filter:
                 continue
 
             # Get the URL (prefer primary link)
-            url = row["Primary Link"].strip() or row["Secondary Link"].strip()
+            url = row[primary_col].strip() or row[secondary_col].strip()
             if not url:
                 continue
 
-            display_name = row["Display Name"]
-            original_category = row["Category"]
+            display_name = row[name_col]
+            original_category = row[category_col]
             category = sanitize_filename(original_category.lower().replace(" & ", "-"))
 
             # Use same sanitized category name for both directories
-            resource_license = row.get("License", "NOT_FOUND").strip()
+            resource_license = (row[license_col] or "NOT_FOUND").strip()
 
-            print(f"\n[{downloaded + 1}] Processing: {display_name}")
+            print(f"\n[{len(tasks) + 1}] Processing: {display_name}")
             print(f"  URL: {url}")
             print(f"  Category: {original_category} -> '{category}'")
 
@@ -404,19 +1036,19 @@ def process_resources(
             print(f"  Sanitized name: '{display_name}' -> '{safe_name}'")
 
             # Primary path for archive (all resources)
-            if url_info["type"] == "gist":
+            if url_info.type == "gist":
                 resource_path = os.path.join(output_dir, category, f"{safe_name}-gist")
                 hosted_path = (
                     os.path.join(hosted_dir, category, safe_name)
                     if resource_license in OPEN_SOURCE_LICENSES
                     else None
                 )
-            elif url_info["type"] == "repo":
+            elif url_info.type == "repo":
                 resource_path = os.path.join(output_dir, category, safe_name)
                 print("  Skipped: Full repository downloads not implemented")
                 skipped += 1
                 continue
-            elif url_info["type"] == "dir":
+            elif url_info.type == "dir":
                 resource_path = os.path.join(output_dir, category, safe_name)
                 hosted_path = (
                     os.path.join(hosted_dir, category, safe_name)
@@ -425,7 +1057,7 @@ def process_resources(
                 )
             else:  # file
                 # Extract filename from path
-                filename = os.path.basename(url_info["path"])
+                filename = os.path.basename(url_info.path)
                 resource_path = os.path.join(output_dir, category, safe_name, filename)
                 hosted_path = (
                     os.path.join(hosted_dir, category, safe_name, filename)
@@ -433,48 +1065,73 @@ def process_resources(
                     else None
                 )
 
-            # Download the resource to archive
-            print(f"  Downloading to archive: {resource_path}")
+            print(f"  Archive path: {resource_path}")
             print(f"  License: {resource_license}")
             if hosted_path:
-                print(f"  Will copy to hosted: {hosted_path}")
+                print(f"  Hosted path: {hosted_path}")
+
+            # Skip resources that are already archived, without any HTTP request;
+            # they don't count towards the download limit
+            if not force and has_content(resource_path):
+                print("  Already downloaded (use --force to re-check)")
+                # Keep the hosted copy in step with the archive
+                if hosted_path:
+                    update_hosted_copy(resource_path, hosted_path)
+                already_downloaded += 1
+                continue
 
-            download_success = download_github_file(url_info, resource_path)
+            tasks.append(
+                DownloadTask(
+                    url_info=url_info,
+                    resource_path=resource_path,
+                    hosted_path=hosted_path,
+                    resource_license=resource_license,
+                    display_name=display_name,
+                )
+            )
 
-            if download_success:
-                print("  ✅ Downloaded successfully")
+    # Create every archive directory once, instead of once per downloaded file.
+    # Directories and gists are moved into place whole, so only their parent is created;
+    # hosted directories are created by link_hosted once a download succeeds.
+    output_dirs = {os.path.dirname(task.resource_path) for task in tasks}
+    for directory in output_dirs:
+        os.makedirs(directory, exist_ok=True)
+
+    # Group repository tasks so that repos with several entries can share one GraphQL query
+    groups: dict[tuple[str, str, str], list[DownloadTask]] = {}
+    for task in tasks:
+        if task.url_info.type in ("file", "dir"):
+            key = (task.url_info.owner, task.url_info.repo, task.url_info.branch)
+            groups.setdefault(key, []).append(task)
+    batches = [
+        (owner, repo, group[i : i + GRAPHQL_BATCH_SIZE])
+        for (owner, repo, _), group in groups.items()
+        if len(group) > 1
+        for i in range(0, len(group), GRAPHQL_BATCH_SIZE)
+    ]
+
+    # Phase 2: execute the downloads concurrently
+    print(f"\nDownloading {len(tasks)} resources with {max_workers} parallel workers...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # GraphQL requires authentication; anything it doesn't return falls back to REST
+        if batches and TOKEN_POOL.tokens:
+            batched = [
+                executor.submit(fetch_with_graphql, owner, repo, batch)
+                for owner, repo, batch in batches
+            ]
+            fetched = {task for future in batched for task in future.result()}
+            downloaded += len(fetched)
+            tasks = [task for task in tasks if task not in fetched]
+
+        futures = [executor.submit(download_resource, task, etag_cache) for task in tasks]
+        for future in as_completed(futures):
+            if future.result():
                 downloaded += 1
-
-                # If open-source licensed, also copy to hosted directory
-                if hosted_path and resource_license in OPEN_SOURCE_LICENSES:
-                    print(f"  📦 Copying to hosted directory: {hosted_path}")
-                    try:
-                        import shutil
-
-                        os.makedirs(os.path.dirname(hosted_path), exist_ok=True)
-
-                        if os.path.isdir(resource_path):
-                            print(
-                                f"     Source is directory with "
-                                f"{len(os.listdir(resource_path))} items"
-                            )
-                            shutil.copytree(resource_path, hosted_path, dirs_exist_ok=True)
-                        else:
-                            print("     Source is file")
-                            shutil.copy2(resource_path, hosted_path)
-                        print("  ✅ Copied to hosted directory")
-                    except Exception as e:
-                        print(f"  ⚠️  Failed to copy to hosted directory: {e}")
-                        print(f"     Error type: {type(e).__name__}")
-                        import traceback
-
-                        print(f"     Traceback: {traceback.format_exc()}")
             else:
-                print("  ❌ Download failed")
                 failed += 1
 
-            # Rate limiting delay
-            time.sleep(random.uniform(1, 2))
+    # Persist ETags so the next run can skip unchanged resources
+    etag_cache.save()
 
     # Summary
     end_time = datetime.now()
@@ -487,6 +1144,7 @@ def process_resources(
     print(f"  Total resources found: {total_resources}")
     print(f"  Downloaded: {downloaded}")
     print(f"  Skipped: {skipped}")
+    print(f"  Already downloaded: {already_downloaded}")
     print(f"  Failed: {failed}")
     print(f"{'=' * 60}")
 
@@ -503,6 +1161,11 @@ def main() -> None:
         default=HOSTED_OUTPUT_DIR,
         help="Hosted output directory for open-source resources",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-check resources already in the archive (unchanged ones still use ETags)",
+    )
 
     args = parser.parse_args()
 
@@ -517,6 +1180,7 @@ def main() -> None:
         max_downloads=args.max_downloads,
         output_dir=args.output_dir,
         hosted_dir=args.hosted_dir,
+        force=args.force,
     )
 
 
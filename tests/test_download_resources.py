@@ -0,0 +1,710 @@
+#!/usr/bin/env python3
+"""
+Unit tests for download_resources.py: URL parsing, rate limit and retry helpers,
+and the download, linking and skip paths (run offline against fake responses).
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import scripts.download_resources as download_resources  # noqa: E402
+from scripts.download_resources import (  # noqa: E402
+    MAX_BACKOFF,
+    MAX_PACING_DELAY,
+    DownloadTask,
+    EtagCache,
+    RateLimitState,
+    TokenPool,
+    UrlInfo,
+    apply_overrides,
+    atomic_write,
+    download_github_file,
+    download_resource,
+    fetch_with_graphql,
+    has_content,
+    link_hosted,
+    link_or_copy,
+    link_tree,
+    parse_github_url,
+    parse_retry_after,
+    retry_delay,
+    sanitize_filename,
+    write_graphql_object,
+)
+
+
+def test_parse_github_file_url() -> None:
+    """Blob URLs parse into a file with branch and path."""
+    assert parse_github_url("https://github.com/owner/repo/blob/main/docs/CLAUDE.md") == UrlInfo(
+        type="file", owner="owner", repo="repo", branch="main", path="docs/CLAUDE.md"
+    )
+
+
+def test_parse_github_dir_url() -> None:
+    """Tree URLs parse into a directory."""
+    url_info = parse_github_url("https://github.com/owner/repo/tree/dev/.claude/commands")
+    assert url_info is not None
+    assert url_info.type == "dir"
+    assert url_info.branch == "dev"
+    assert url_info.path == ".claude/commands"
+
+
+def test_parse_github_repo_and_gist_urls() -> None:
+    """Repository roots and gists parse with only their relevant fields."""
+    assert parse_github_url("https://github.com/owner/repo/") == UrlInfo(
+        type="repo", owner="owner", repo="repo"
+    )
+    assert parse_github_url("https://gist.github.com/user/abc123#file-x") == UrlInfo(
+        type="gist", owner="user", gist_id="abc123"
+    )
+
+
+def test_parse_non_github_url() -> None:
+    """Other URLs are not parsed."""
+    assert parse_github_url("https://example.com/owner/repo") is None
+
+
+def test_parse_github_url_is_cached() -> None:
+    """Repeated URLs return the same cached object."""
+    url = "https://github.com/owner/repo/blob/main/cached.md"
+    assert parse_github_url(url) is parse_github_url(url)
+
+
+def test_sanitize_filename() -> None:
+    """Unsafe characters are dropped and whitespace becomes hyphens."""
+    assert sanitize_filename('  My: "Cool" Tool, v2?  ') == "My-Cool-Tool-v2"
+
+
+def rate_limit_headers(remaining: int, reset_in: float) -> dict[str, str]:
+    """Build GitHub rate limit response headers."""
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+def test_recommended_delay_without_data() -> None:
+    """No rate limit seen yet means no delay."""
+    assert RateLimitState().recommended_delay() == 0.0
+
+
+def test_recommended_delay_spreads_budget() -> None:
+    """The delay spreads the remaining requests over the time to reset."""
+    state = RateLimitState()
+    state.update(rate_limit_headers(remaining=1000, reset_in=1000))
+    assert 0.9 <= state.recommended_delay() <= 1.0
+
+
+def test_recommended_delay_is_clamped() -> None:
+    """The delay never exceeds the cap and never goes negative."""
+    state = RateLimitState()
+    state.update(rate_limit_headers(remaining=0, reset_in=3600))
+    assert state.recommended_delay() == MAX_PACING_DELAY
+
+    state.update(rate_limit_headers(remaining=10, reset_in=-60))
+    assert state.recommended_delay() == 0.0
+
+
+def test_max_parallel_follows_budget() -> None:
+    """Parallelism is capped by the remaining budget but never drops below one."""
+    state = RateLimitState()
+    assert state.max_parallel(16) == 16
+
+    state.update(rate_limit_headers(remaining=4000, reset_in=3600))
+    assert state.max_parallel(16) == 16
+
+    state.update(rate_limit_headers(remaining=5, reset_in=3600))
+    assert state.max_parallel(16) == 5
+
+    state.update(rate_limit_headers(remaining=0, reset_in=3600))
+    assert state.max_parallel(16) == 1
+
+
+def test_rate_limit_ignores_missing_headers() -> None:
+    """Responses without rate limit headers leave the state unchanged."""
+    state = RateLimitState()
+    state.update(rate_limit_headers(remaining=50, reset_in=100))
+    state.update({})
+    assert state.remaining == 50
+
+
+def test_token_pool_budget_combines_tokens() -> None:
+    """The pool budget sums every token's remaining requests, once all have reported."""
+    pool = TokenPool(["a", "b"])
+    pool.update("a", rate_limit_headers(remaining=1000, reset_in=1000))
+    assert pool.budget() == (None, None)
+
+    pool.update("b", rate_limit_headers(remaining=500, reset_in=2000))
+    remaining, reset = pool.budget()
+    assert remaining == 1500
+    assert reset is not None and reset <= time.time() + 1000
+
+
+def test_token_pool_paces_at_combined_rate(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With two tokens, API requests are spaced at half the single-token delay."""
+    pool = TokenPool(["a", "b"])
+    state = RateLimitState()
+    monkeypatch.setattr(download_resources, "TOKEN_POOL", pool)
+    monkeypatch.setattr(download_resources, "RATE_LIMIT", state)
+    monkeypatch.setattr(download_resources.time, "sleep", lambda seconds: None)
+    headers = rate_limit_headers(remaining=1000, reset_in=1000)
+    monkeypatch.setattr(
+        download_resources.SESSION, "get", lambda url, **kwargs: fake_response(200, headers)
+    )
+
+    for _ in range(2):
+        download_resources.github_get("https://api.github.com/rate_limit")
+    assert state.remaining == 2000
+    assert 0.45 <= state.recommended_delay() <= 0.5
+
+
+def test_token_pool_round_robin() -> None:
+    """Tokens are handed out in rotation."""
+    pool = TokenPool(["a", "b", "c"])
+    assert [pool.next_token() for _ in range(6)] == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_token_pool_empty() -> None:
+    """An empty pool yields no token and no budget."""
+    pool = TokenPool([])
+    assert pool.next_token() is None
+    assert not pool.has_budget()
+
+
+def test_token_pool_skips_low_tokens() -> None:
+    """Tokens close to their limit are skipped until they reset."""
+    pool = TokenPool(["a", "b"])
+    pool.update("a", rate_limit_headers(remaining=3, reset_in=600))
+    assert [pool.next_token() for _ in range(3)] == ["b", "b", "b"]
+
+    pool.update("a", rate_limit_headers(remaining=3, reset_in=-1))
+    assert "a" in {pool.next_token() for _ in range(2)}
+
+
+def test_token_pool_all_exhausted() -> None:
+    """With every token exhausted, the one resetting first is used."""
+    pool = TokenPool(["a", "b"])
+    pool.update("a", rate_limit_headers(remaining=0, reset_in=600))
+    pool.update("b", rate_limit_headers(remaining=0, reset_in=60))
+    assert pool.next_token() == "b"
+    assert not pool.has_budget()
+
+
+def fake_response(status_code: int, headers: dict[str, str], body: bytes = b"") -> Any:
+    """Build a minimal stand-in for requests.Response."""
+    return SimpleNamespace(
+        status_code=status_code,
+        headers=headers,
+        content=body,
+        text=body.decode(errors="replace"),
+        raw=io.BytesIO(body),
+        iter_content=lambda chunk_size: [body],
+        close=lambda: None,
+    )
+
+
+def test_retry_delay_honors_retry_after() -> None:
+    """Retry-After from GitHub takes precedence over backoff."""
+    response = fake_response(429, {"Retry-After": "42"})
+    assert retry_delay(response, 0) == 42.0
+
+
+def test_retry_delay_waits_for_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An exhausted limit with no spare token waits until the reset."""
+    monkeypatch.setattr(download_resources, "TOKEN_POOL", TokenPool([]))
+    response = fake_response(403, rate_limit_headers(remaining=0, reset_in=120))
+    assert 115 <= retry_delay(response, 0) <= 120
+
+
+def test_retry_delay_skips_reset_with_spare_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Another token with budget means a short backoff instead of waiting for reset."""
+    monkeypatch.setattr(download_resources, "TOKEN_POOL", TokenPool(["a", "b"]))
+    response = fake_response(403, rate_limit_headers(remaining=0, reset_in=3600))
+    assert retry_delay(response, 0) < 2
+
+
+def test_retry_delay_backoff_is_capped() -> None:
+    """Other failures back off exponentially with jitter, up to the cap."""
+    assert 1 <= retry_delay(None, 0) <= 2
+    assert 8 <= retry_delay(None, 3) <= 9
+    assert MAX_BACKOFF <= retry_delay(None, 10) <= MAX_BACKOFF + 1
+
+
+def test_retry_delay_ignores_unparseable_retry_after() -> None:
+    """A malformed Retry-After falls back to backoff instead of raising."""
+    assert 1 <= retry_delay(fake_response(429, {"Retry-After": "soon"}), 0) <= 2
+
+
+def test_parse_retry_after_http_date() -> None:
+    """Retry-After may be an HTTP date; past dates mean no wait."""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+
+
+def test_wait_for_slot_spaces_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Consecutive slots are spaced by the delay instead of each caller sleeping it alone."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(download_resources.time, "sleep", sleeps.append)
+    state = RateLimitState()
+    state.update(rate_limit_headers(remaining=1000, reset_in=1000))
+    for _ in range(3):
+        state.wait_for_slot()
+    assert sleeps[0] < 0.1
+    assert 0.8 <= sleeps[1] <= 1.0
+    assert 1.7 <= sleeps[2] <= 2.0
+
+
+def fake_github_get(monkeypatch: pytest.MonkeyPatch, responses: dict[str, Any]) -> list[str]:
+    """Route github_get to canned responses by URL; return the list of requested URLs."""
+    calls: list[str] = []
+
+    def github_get(url: str, **kwargs: Any) -> Any:
+        calls.append(url)
+        return responses.get(url) or fake_response(404, {})
+
+    monkeypatch.setattr(download_resources, "github_get", github_get)
+    monkeypatch.setattr(download_resources.time, "sleep", lambda seconds: None)
+    return calls
+
+
+def test_download_retries_secondary_rate_limit(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A 403 with Retry-After but budget remaining is retried."""
+    url = "https://api.github.com/gists/abc"
+    response = fake_response(403, {"Retry-After": "1", "X-RateLimit-Remaining": "4000"})
+    calls = fake_github_get(monkeypatch, {url: response})
+    url_info = UrlInfo(type="gist", owner="user", gist_id="abc")
+    assert not download_github_file(url_info, str(tmp_path / "gist"), max_retries=2)
+    assert len(calls) == 3
+
+
+def make_tarball(files: dict[str, bytes]) -> bytes:
+    """Build a gzipped tarball the way GitHub lays out repository archives."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(f"owner-repo-abc123/{name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_download_dir_extracts_only_direct_children(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The tarball root is stripped and only files directly in the directory are kept."""
+    tarball = make_tarball(
+        {
+            "cmds/a.md": b"A",
+            "cmds/b.md": b"B",
+            "cmds/sub/c.md": b"C",
+            "cmdsx/d.md": b"D",
+            "other.md": b"X",
+        }
+    )
+    fake_github_get(
+        monkeypatch,
+        {"https://api.github.com/repos/owner/repo/tarball/main": fake_response(200, {}, tarball)},
+    )
+    output = tmp_path / "out" / "Cmds"
+    url_info = UrlInfo(type="dir", owner="owner", repo="repo", branch="main", path="cmds/")
+
+    assert download_github_file(url_info, str(output))
+    assert sorted(os.listdir(output)) == ["a.md", "b.md"]
+    assert (output / "a.md").read_bytes() == b"A"
+    assert not (tmp_path / "out" / "Cmds.tmp").exists()
+
+
+def test_download_dir_without_matches_writes_nothing(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A directory missing from the tarball fails without creating any directory."""
+    fake_github_get(
+        monkeypatch,
+        {
+            "https://api.github.com/repos/owner/repo/tarball/main": fake_response(
+                200, {}, make_tarball({"other.md": b"X"})
+            )
+        },
+    )
+    url_info = UrlInfo(type="dir", owner="owner", repo="repo", branch="main", path="cmds")
+    assert not download_github_file(url_info, str(tmp_path / "Cmds"))
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_gist_fetches_truncated_files(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Truncated gist files are downloaded in full from their raw URL."""
+    raw_url = "https://gist.githubusercontent.com/user/abc/raw/big.txt"
+    gist = {
+        "files": {
+            "small.md": {"content": "small", "truncated": False},
+            "big.txt": {"content": "cut", "truncated": True, "raw_url": raw_url},
+        }
+    }
+    fake_github_get(
+        monkeypatch,
+        {
+            "https://api.github.com/gists/abc": fake_response(200, {}, json.dumps(gist).encode()),
+            raw_url: fake_response(200, {}, b"the whole file"),
+        },
+    )
+    output = tmp_path / "gist"
+    url_info = UrlInfo(type="gist", owner="user", gist_id="abc")
+
+    assert download_github_file(url_info, str(output))
+    assert (output / "small.md").read_text() == "small"
+    assert (output / "big.txt").read_bytes() == b"the whole file"
+
+
+def test_download_gist_failure_leaves_no_partial_directory(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A gist that fails after some files were written leaves nothing behind."""
+    gist = {
+        "files": {
+            "small.md": {"content": "small", "truncated": False},
+            "big.txt": {"content": "cut", "truncated": True, "raw_url": "https://raw/big"},
+        }
+    }
+    fake_github_get(
+        monkeypatch,
+        {"https://api.github.com/gists/abc": fake_response(200, {}, json.dumps(gist).encode())},
+    )
+    url_info = UrlInfo(type="gist", owner="user", gist_id="abc")
+
+    assert not download_github_file(url_info, str(tmp_path / "gist"), max_retries=0)
+    assert os.listdir(tmp_path) == []
+
+
+def make_task(tmp_path: Path, url_type: str, path: str, hosted: bool = True) -> DownloadTask:
+    """Build a task writing under tmp_path/out, hosted under tmp_path/hosted."""
+    return DownloadTask(
+        url_info=UrlInfo(type=url_type, owner="owner", repo="repo", branch="main", path=path),
+        resource_path=str(tmp_path / "out" / path),
+        hosted_path=str(tmp_path / "hosted" / path) if hosted else None,
+        resource_license="MIT",
+        display_name=path,
+    )
+
+
+def test_write_graphql_file(tmp_path: Path) -> None:
+    """A text blob is written to the archive; hosted linking is left to the caller."""
+    task = make_task(tmp_path, "file", "CLAUDE.md")
+    (tmp_path / "out").mkdir()
+    assert write_graphql_object(task, {"text": "hello", "isBinary": False, "isTruncated": False})
+    assert Path(task.resource_path).read_text() == "hello"
+    assert not os.path.exists(str(task.hosted_path))
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        None,
+        {"text": None, "isBinary": True, "isTruncated": False},
+        {"text": "partial", "isBinary": False, "isTruncated": True},
+    ],
+)
+def test_write_graphql_file_falls_back(tmp_path: Path, obj: dict[str, Any] | None) -> None:
+    """Missing, binary and truncated blobs are left to the REST download."""
+    task = make_task(tmp_path, "file", "CLAUDE.md")
+    (tmp_path / "out").mkdir()
+    assert not write_graphql_object(task, obj)
+    assert not os.path.exists(task.resource_path)
+
+
+def test_write_graphql_dir(tmp_path: Path) -> None:
+    """A tree writes its blobs and ignores subdirectories."""
+    task = make_task(tmp_path, "dir", "cmds")
+    (tmp_path / "out").mkdir()
+    tree = {
+        "entries": [
+            {"name": "a.md", "type": "blob", "object": {"text": "A", "isTruncated": False}},
+            {"name": "sub", "type": "tree", "object": {}},
+        ]
+    }
+    assert write_graphql_object(task, tree)
+    assert os.listdir(task.resource_path) == ["a.md"]
+
+
+def test_write_graphql_dir_with_truncated_blob(tmp_path: Path) -> None:
+    """One truncated blob sends the whole directory to the REST download."""
+    task = make_task(tmp_path, "dir", "cmds")
+    (tmp_path / "out").mkdir()
+    tree = {
+        "entries": [
+            {"name": "a.md", "type": "blob", "object": {"text": "A", "isTruncated": False}},
+            {"name": "b.md", "type": "blob", "object": {"text": "B", "isTruncated": True}},
+        ]
+    }
+    assert not write_graphql_object(task, tree)
+    assert not os.path.exists(task.resource_path)
+
+
+def test_fetch_with_graphql_builds_aliased_query(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """One query aliases each entry, links what it wrote and returns those tasks."""
+    (tmp_path / "out").mkdir()
+    tasks = [make_task(tmp_path, "file", "a.md"), make_task(tmp_path, "file", "b.md")]
+    queries: list[str] = []
+    data = {"f0": {"text": "A", "isBinary": False}, "f1": None}
+    body = json.dumps({"data": {"repository": data}}).encode()
+
+    def post(url: str, json: dict[str, str], **kwargs: Any) -> Any:
+        queries.append(json["query"])
+        return fake_response(200, {}, body)
+
+    monkeypatch.setattr(download_resources.SESSION, "post", post)
+    monkeypatch.setattr(download_resources, "RATE_LIMIT", RateLimitState())
+
+    assert fetch_with_graphql("owner", "repo", tasks) == [tasks[0]]
+    assert os.path.samefile(tasks[0].resource_path, str(tasks[0].hosted_path))
+    (query,) = queries
+    assert 'repository(owner: "owner", name: "repo")' in query
+    assert 'f0: object(expression: "main:a.md")' in query
+    assert 'f1: object(expression: "main:b.md")' in query
+    assert "isTruncated" in query
+
+
+def test_atomic_write_cleans_up_on_error(tmp_path: Path) -> None:
+    """A failed write leaves neither the target nor the temporary file."""
+    path = tmp_path / "file.md"
+    with pytest.raises(RuntimeError), atomic_write(str(path)) as f:
+        f.write(b"partial")
+        raise RuntimeError("interrupted")
+    assert os.listdir(tmp_path) == []
+
+
+def test_has_content(tmp_path: Path) -> None:
+    """Empty files, empty directories and directories holding only *.tmp files don't count."""
+    empty_file = tmp_path / "empty.md"
+    empty_file.touch()
+    assert not has_content(str(empty_file))
+    assert not has_content(str(tmp_path / "missing"))
+
+    directory = tmp_path / "dir"
+    directory.mkdir()
+    assert not has_content(str(directory))
+    (directory / "a.md.tmp").write_bytes(b"partial")
+    assert not has_content(str(directory))
+    (directory / "a.md").write_bytes(b"A")
+    assert has_content(str(directory))
+
+
+def test_link_or_copy_replaces_and_skips_same_file(tmp_path: Path) -> None:
+    """An existing destination is replaced by a hardlink; a linked one is left alone."""
+    source, destination = tmp_path / "source.md", tmp_path / "destination.md"
+    source.write_text("new")
+    destination.write_text("old")
+
+    link_or_copy(str(source), str(destination))
+    assert destination.read_text() == "new"
+    assert os.path.samefile(source, destination)
+
+    link_or_copy(str(source), str(destination))
+    assert os.stat(source).st_nlink == 2
+
+
+def test_link_tree(tmp_path: Path) -> None:
+    """Trees are recreated with hardlinks."""
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "sub" / "b.md").write_text("B")
+
+    link_tree(str(source), str(tmp_path / "tree"))
+    assert os.path.samefile(source / "sub" / "b.md", tmp_path / "tree" / "sub" / "b.md")
+
+
+def test_download_resource_survives_hosted_link_failure(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A hosted copy that can't be linked warns without failing or re-downloading."""
+    calls = fake_github_get(
+        monkeypatch,
+        {"https://raw.githubusercontent.com/owner/repo/main/a.md": fake_response(200, {}, b"A")},
+    )
+    task = make_task(tmp_path, "file", "a.md")
+    (tmp_path / "out").mkdir()
+    # A directory where the hosted file should go makes the link fail
+    Path(str(task.hosted_path)).mkdir(parents=True)
+
+    assert download_resource(task)
+    assert Path(task.resource_path).read_bytes() == b"A"
+    assert len(calls) == 1
+
+
+def test_link_hosted_creates_parents(tmp_path: Path) -> None:
+    """Hosted parents are created only when a file is linked into them."""
+    source = tmp_path / "a.md"
+    source.write_text("A")
+
+    link_hosted(str(source), str(tmp_path / "hosted" / "deep" / "a.md"))
+    assert os.path.samefile(source, tmp_path / "hosted" / "deep" / "a.md")
+
+
+def test_apply_overrides_by_column_index() -> None:
+    """Overrides update the mapped columns and ignore locked flags and notes."""
+    columns = {"ID": 0, "Active": 1, "License": 2, "Description": 3}
+    overrides = {
+        "res-1": {"license": "MIT", "license_locked": True, "notes": "n", "active": "FALSE"}
+    }
+    row = ["res-1", "TRUE", "NOT_FOUND", "desc"]
+    assert apply_overrides(row, 0, columns, overrides) == ["res-1", "FALSE", "MIT", "desc"]
+    assert apply_overrides(["res-2", "TRUE", "", ""], 0, columns, overrides) == [
+        "res-2",
+        "TRUE",
+        "",
+        "",
+    ]
+
+
+def write_resources_csv(path: Path, names: list[str]) -> None:
+    """Write a resources CSV with one active MIT file resource per name."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "ID",
+                "Display Name",
+                "Category",
+                "Primary Link",
+                "Secondary Link",
+                "Active",
+                "License",
+            ]
+        )
+        for name in names:
+            url = f"https://github.com/owner/repo/blob/main/{name}.md"
+            writer.writerow([f"test-{name}", name, "Tooling", url, "", "TRUE", "MIT"])
+
+
+def test_process_resources_skips_archived_and_caps_pending(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Archived resources are relinked without requests and don't count toward the limit."""
+    csv_path = tmp_path / "resources.csv"
+    write_resources_csv(csv_path, ["old", "new", "later"])
+    monkeypatch.setattr(download_resources, "CSV_FILE", str(csv_path))
+    monkeypatch.setattr(download_resources, "load_overrides", lambda: {})
+    monkeypatch.setattr(download_resources, "RATE_LIMIT", RateLimitState())
+    calls = fake_github_get(
+        monkeypatch,
+        {
+            "https://raw.githubusercontent.com/owner/repo/main/new.md": fake_response(
+                200, {}, b"new"
+            )
+        },
+    )
+    output, hosted = tmp_path / "out", tmp_path / "hosted"
+    archived = output / "tooling" / "old" / "old.md"
+    archived.parent.mkdir(parents=True)
+    archived.write_text("old")
+
+    download_resources.process_resources(
+        max_downloads=1, output_dir=str(output), hosted_dir=str(hosted)
+    )
+
+    assert calls == [
+        "https://api.github.com/rate_limit",
+        "https://raw.githubusercontent.com/owner/repo/main/new.md",
+    ]
+    assert os.path.samefile(archived, hosted / "tooling" / "old" / "old.md")
+    assert (output / "tooling" / "new" / "new.md").read_text() == "new"
+    assert not (output / "tooling" / "later").exists()
+
+
+def test_process_resources_survives_hosted_link_failure(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A hosted copy that can't be relinked for an archived resource doesn't abort the run."""
+    csv_path = tmp_path / "resources.csv"
+    write_resources_csv(csv_path, ["old"])
+    monkeypatch.setattr(download_resources, "CSV_FILE", str(csv_path))
+    monkeypatch.setattr(download_resources, "load_overrides", lambda: {})
+    monkeypatch.setattr(download_resources, "RATE_LIMIT", RateLimitState())
+    fake_github_get(monkeypatch, {})
+    output, hosted = tmp_path / "out", tmp_path / "hosted"
+    archived = output / "tooling" / "old" / "old.md"
+    archived.parent.mkdir(parents=True)
+    archived.write_text("old")
+    (hosted / "tooling" / "old" / "old.md").mkdir(parents=True)
+
+    download_resources.process_resources(output_dir=str(output), hosted_dir=str(hosted))
+
+    assert (output / ".etags.json").exists()
+
+
+def test_etag_cache_round_trip(tmp_path: Path) -> None:
+    """ETags and hashes survive a save and reload; responses without an ETag aren't stored."""
+    path = str(tmp_path / "out" / ".etags.json")
+    cache = EtagCache(path)
+    cache.set("https://example/a", '"v1"', "abc")
+    cache.set("https://example/b", None, "def")
+    cache.save()
+
+    reloaded = EtagCache(path)
+    assert reloaded.get("https://example/a") == '"v1"'
+    assert reloaded.sha256("https://example/a") == "abc"
+    assert reloaded.get("https://example/b") is None
+
+
+def test_etag_cache_ignores_corrupt_file(tmp_path: Path) -> None:
+    """An unreadable sidecar starts an empty cache instead of failing the run."""
+    path = tmp_path / ".etags.json"
+    path.write_text("{not json")
+    assert EtagCache(str(path)).get("https://example/a") is None
+
+
+def test_conditional_download_flow(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """
+    The first download stores the ETag, a later run sends it and relinks on 304,
+    and a file whose bytes changed on disk is fetched again unconditionally.
+    """
+    raw_url = "https://raw.githubusercontent.com/owner/repo/main/a.md"
+    sent_etags: list[str | None] = []
+
+    def github_get(url: str, etag: str | None = None, **kwargs: Any) -> Any:
+        assert url == raw_url
+        sent_etags.append(etag)
+        if etag == '"v1"':
+            return fake_response(304, {})
+        return fake_response(200, {"ETag": '"v1"'}, b"A")
+
+    monkeypatch.setattr(download_resources, "github_get", github_get)
+    task = make_task(tmp_path, "file", "a.md")
+    (tmp_path / "out").mkdir()
+    cache_path = str(tmp_path / "out" / ".etags.json")
+
+    cache = EtagCache(cache_path)
+    assert download_resource(task, cache)
+    cache.save()
+
+    # A later run: conditional request, 304, and the missing hosted copy is relinked
+    os.unlink(str(task.hosted_path))
+    cache = EtagCache(cache_path)
+    assert download_resource(task, cache)
+    assert os.path.samefile(task.resource_path, str(task.hosted_path))
+
+    # The archived file no longer matches its hash, so the ETag isn't trusted
+    Path(task.resource_path).write_bytes(b"tampered")
+    assert download_resource(task, cache)
+    assert Path(task.resource_path).read_bytes() == b"A"
+
+    assert sent_etags == [None, '"v1"', None]